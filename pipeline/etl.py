@@ -1,35 +1,211 @@
 # zentel_pipeline/pipeline/etl.py
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+try:  # numba is optional; without it compute_sla_metrics uses the vectorized pandas path only
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+_PANDAS_3 = int(pd.__version__.split(".")[0]) >= 3
+
+
+def _stage_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    New frame for a stage to write its columns into without touching the caller's frame.
+    Under copy-on-write (always on in pandas 3, opt-in before) a shallow copy is enough, and its
+    buffers are only duplicated when written; otherwise a real copy is needed.
+    The caller's pandas options are never changed.
+    """
+    cow = _PANDAS_3 or pd.get_option("mode.copy_on_write") is True
+    return df.copy(deep=not cow)
+
+
+# text columns are kept as Arrow-backed strings (contiguous UTF-8 buffers) with NaN as the missing value
+# (the NaN-valued variant needs pandas >= 2.3)
+TEXT_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+
+
+def _to_text_dtype(df: pd.DataFrame) -> None:
+    """
+    Convert the plain string columns of df (object or other string dtypes) to TEXT_DTYPE in place.
+    Categorical and non-text columns are left alone.
+    """
+    for c in df.columns:
+        s = df[c]
+        if s.dtype == TEXT_DTYPE or isinstance(s.dtype, pd.CategoricalDtype):
+            continue
+        if isinstance(s.dtype, pd.StringDtype) or (
+                s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty")):
+            df[c] = s.astype(TEXT_DTYPE)
+
+
+TABLE_FILES = ["service_data.csv", "employees.csv", "service_type.csv", "channel.csv", "fault_type.csv", "location.csv"]
+
+
+def _read_csv_text(path: Path) -> pd.DataFrame:
+    """
+    Read a CSV with the (multithreaded) pyarrow parser, every column typed as string up front.
+    Values are kept exactly as written (no type inference, so "007" or "1.50" survive);
+    empty and NA-like fields become NaN.
+    """
+    # header names come from pyarrow's own parser (first block only), de-duplicated like pandas does
+    try:
+        with pa_csv.open_csv(path) as reader:
+            names = _dedup_names(reader.schema.names)
+    except pa.ArrowInvalid:  # empty file
+        return pd.DataFrame()
+    read_opts = pa_csv.ReadOptions(column_names=names, skip_rows=1)
+    opts = pa_csv.ConvertOptions(column_types={c: pa.string() for c in names}, strings_can_be_null=True)
+    return pa_csv.read_csv(path, read_options=read_opts, convert_options=opts).to_pandas(
+        types_mapper=lambda _: TEXT_DTYPE)
+
+
+def _dedup_names(names):
+    """
+    Rename repeated column names the way pd.read_csv does: A, A -> A, A.1.
+    """
+    original = set(names)
+    counts = {}
+    out = []
+    for name in names:
+        base = name
+        cur = counts.get(base, 0)
+        while cur > 0:
+            counts[base] = cur + 1
+            name = f"{base}.{cur}"
+            # skip suffixes already taken by another column in the header
+            cur = cur + 1 if name in original else counts.get(name, 0)
+        out.append(name)
+        counts[name] = cur + 1
+    return out
+
+
+# bump whenever the CSV read logic changes, so caches written by older versions are rebuilt
+PARQUET_CACHE_VERSION = 3
+
+
+def _cache_path(csv_path: Path) -> Path:
+    return csv_path.with_suffix(f".v{PARQUET_CACHE_VERSION}.parquet")
+
+
+# Parquet schema metadata key recording which CSV (size and mtime) the cache was built from
+_CACHE_SOURCE_KEY = b"zentel_source_csv"
+
+
+def _csv_signature(csv_path: Path) -> bytes:
+    st = csv_path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}".encode()
+
+
+def _read_parquet(path: Path, csv_path: Path):
+    """
+    Read the Parquet copy of a table if it exists and was built from the current CSV
+    (same size and mtime); else None.
+    An unreadable cache (e.g. truncated) also returns None so the caller falls back to the CSV.
+    """
+    if not path.exists():
+        return None
+    try:
+        table = pq.read_table(path)
+    except (OSError, ValueError):
+        return None
+    if csv_path.exists() and (table.schema.metadata or {}).get(_CACHE_SOURCE_KEY) != _csv_signature(csv_path):
+        return None
+    df = table.to_pandas()
+    _to_text_dtype(df)
+    return df
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, source: bytes) -> None:
+    """
+    Write the Parquet cache atomically: a temp file in the same directory is moved into place,
+    so an interrupted or concurrent write never leaves a partial cache behind.
+    source is the signature of the CSV the frame was read from.
+    """
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    except OSError:
+        return  # read-only data dir: just skip the cache
+    os.close(fd)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _CACHE_SOURCE_KEY: source})
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
 
 
 def load_tables(data_dir: str) -> Dict[str, pd.DataFrame]:
     """
     Loads CSV files from the data directory into DataFrames.
     Expects files: service_data.csv, employees.csv, service_type.csv, channel.csv, fault_type.csv, location.csv
+    Each CSV is cached as a zstd Parquet file next to it (e.g. service_data.v3.parquet, versioned by
+    PARQUET_CACHE_VERSION) on first read; later runs load the Parquet copy unless the CSV's size or
+    mtime changed since, or the copy is unreadable. A Parquet file without a CSV is used as is.
     Returns a dict of DataFrames.
     """
     p = Path(data_dir)
     def _read(name):
         path = p / name
+        cached = _read_parquet(_cache_path(path), path)
+        if cached is not None:
+            return cached
         if not path.exists():
             return pd.DataFrame()
-        # Try reading with engine fallback and ignore leading/trailing whitespace
-        return pd.read_csv(path, dtype=str).applymap(lambda v: v.strip() if isinstance(v, str) else v)
-
-    tables = {
-        "service_data": _read("service_data.csv"),
-        "employees": _read("employees.csv"),
-        "service_type": _read("service_type.csv"),
-        "channel": _read("channel.csv"),
-        "fault_type": _read("fault_type.csv"),
-        "location": _read("location.csv"),
-    }
+        # taken before reading, so a CSV rewritten mid-read never matches the cache
+        source = _csv_signature(path)
+        # read as text and strip leading/trailing whitespace column-wise
+        df = _read_csv_text(path)
+        for c in df.columns:
+            df[c] = df[c].str.strip()
+        _write_parquet(df, _cache_path(path), source)
+        return df
+
+    # the files are independent, so read them concurrently (the parser releases the GIL)
+    with ThreadPoolExecutor(max_workers=len(TABLE_FILES)) as ex:
+        tables = dict(zip([n.split(".")[0] for n in TABLE_FILES], ex.map(_read, TABLE_FILES)))
     return tables
 
 
+# formats tried in order when parsing ticket timestamps
+DATETIME_FORMATS = ("%Y/%m/%d %H:%M:%S", "%m/%d/%Y %H:%M", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S")
+
+
+def _parse_datetimes(s: pd.Series) -> pd.Series:
+    """
+    Parse a column of datetime strings, trying each of DATETIME_FORMATS over the whole column
+    and only re-parsing the values still unresolved; anything left falls back to pandas' parser.
+    Blank and missing values become NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    mask = s.notna() & (s.astype(str).str.strip() != "")
+    for fmt in DATETIME_FORMATS:
+        todo = mask & out.isna()
+        if not todo.any():
+            return out
+        out.loc[todo] = pd.to_datetime(s[todo], format=fmt, errors="coerce")
+    # fallback to pandas parser, element by element
+    still = mask & out.isna()
+    if still.any():
+        out.loc[still] = pd.to_datetime(s[still], format="mixed", errors="coerce")
+    return out
+
+
 def clean_tickets(df: pd.DataFrame) -> pd.DataFrame:
     """
     Parse datetimes, normalize column names, handle missing values.
@@ -43,25 +219,10 @@ def clean_tickets(df: pd.DataFrame) -> pd.DataFrame:
     # normalize column names to snake_case (basic)
     df = df.rename(columns=lambda s: s.strip().lower().replace(" ", "_"))
 
-    # helper to parse datetimes robustly
-    def parse_dt(val):
-        if pd.isna(val) or str(val).strip() == "":
-            return pd.NaT
-        for fmt in ("%Y/%m/%d %H:%M:%S", "%m/%d/%Y %H:%M", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S"):
-            try:
-                return pd.to_datetime(val, format=fmt)
-            except Exception:
-                continue
-        # fallback to pandas parser
-        try:
-            return pd.to_datetime(val, infer_datetime_format=True, errors="coerce")
-        except Exception:
-            return pd.NaT
-
     # parse the key time columns (if present)
     for col in ["ticket_open_time", "ticket_resp_time", "issue_res_time", "ticket_close_time"]:
         if col in df.columns:
-            df[col] = df[col].apply(parse_dt)
+            df[col] = _parse_datetimes(df[col])
 
     # fill missing operator
     if "operator" in df.columns:
@@ -73,65 +234,300 @@ def clean_tickets(df: pd.DataFrame) -> pd.DataFrame:
     if "report_id" in df.columns:
         df["report_id"] = df["report_id"].astype(str).str.strip()
         # try to extract the last hyphen piece as code (e.g., AXA-20201231-1101-WLESS)
-        df["service_code"] = df["report_id"].str.split("-", expand=True).iloc[:, -1].fillna("")
+        df["service_code"] = df["report_id"].str.extract(r"-([^-]+)$", expand=False).fillna("")
     else:
         df["service_code"] = ""
 
+    _to_text_dtype(df)
+
+    # repeated key columns become categoricals so later joins/groupbys work on integer codes
+    for c in ("operator", "report_channel", "state_key", "service_code", "fault_type"):
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+
     return df
 
 
-def enrich_tickets(tickets_df: pd.DataFrame, employees_df: pd.DataFrame, channel_df: pd.DataFrame = None,
-                   service_type_df: pd.DataFrame = None, fault_type_df: pd.DataFrame = None,
-                   location_df: pd.DataFrame = None) -> pd.DataFrame:
+def _join_codes(left: pd.Series, right: pd.Series):
     """
-    Left-join lookup tables onto tickets_df.
-    Joins performed:
-      - employees by Operator -> Employee_name or by matching Employee_name column
-      - channel by Report Channel -> Channel Key
-      - service_type by service_code -> Service Code
-      - fault_type by Fault Type text -> Fault
-      - location by State Key -> State Key
+    Factorize two join-key columns against a shared set of uniques.
+    Returns (left_codes, right_codes) as integer arrays; equal keys get equal codes.
+    A categorical left key is reused as is and right is coded against its categories.
     """
-    if tickets_df is None or tickets_df.empty:
-        return pd.DataFrame()
+    if isinstance(left.dtype, pd.CategoricalDtype):
+        right_codes = left.cat.categories.get_indexer(right).astype(np.int64)
+        # right values outside left's categories can never match (-1 stays reserved for missing keys)
+        right_codes[(right_codes == -1) & right.notna().to_numpy()] = -2
+        return left.cat.codes.to_numpy(), right_codes
+    codes, _ = pd.factorize(pd.concat([left, right], ignore_index=True))
+    return codes[:len(left)], codes[len(left):]
+
 
-    df = tickets_df.copy()
+def _lookup_block(lk: pd.DataFrame, left_key: pd.Series, taken: set, suffix: str) -> pd.DataFrame:
+    """
+    Columns of the prepared lookup lk for each row of left_key (a left join, matching left_key
+    against lk["_join_key"]), returned positionally aligned with left_key on a RangeIndex.
+    Rows are taken by the factorized integer codes (reindex) instead of merging a full frame.
+    lk is treated as a dimension table: when a key appears more than once, its first row wins
+    and the other rows are silently ignored (ticket rows are never multiplied).
+    Columns whose name is already in taken get suffix appended, like merge(suffixes=("", suffix)).
+    """
+    left_codes, right_codes = _join_codes(left_key, lk["_join_key"])
+    right = lk.drop(columns="_join_key").set_axis(right_codes)
+    right = right[~right.index.duplicated()]
+    block = right.reindex(left_codes).reset_index(drop=True)
+    return block.rename(columns={c: f"{c}{suffix}" for c in block.columns if c in taken})
+
+
+def _with_columns(df: pd.DataFrame, blocks) -> pd.DataFrame:
+    """
+    Append column blocks (positionally aligned with df) to df in a single concat.
+    Like the merges this replaces, joining anything resets the index.
+    """
+    if not blocks:
+        return df
+    df = df.reset_index(drop=True)
+    return pd.concat([df, *blocks], axis=1)
+
+
+# lookup table -> column holding its join key (after snake_case renaming)
+LOOKUP_KEYS = {
+    "employees": "employee_name",
+    "channel": "channel_key",
+    "service_type": "service_code",
+    "fault_type": "fault",
+    "location": "state_key",
+}
+
+
+def _prepare_lookup(name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a lookup table for enrich_tickets: snake_case columns plus a "_join_key" column
+    holding the normalized join key. Tables already prepared are returned unchanged.
+    """
+    if "_join_key" in df.columns:
+        return df
+    lk = df.rename(columns=lambda s: s.strip().lower().replace(" ", "_"))
+    _to_text_dtype(lk)
+    key = LOOKUP_KEYS[name]
+    if name == "employees":
+        # operator names are matched case-insensitively
+        lk["employee_name_lc"] = lk.get(key, pd.Series("", index=lk.index)).astype(str).str.lower()
+        lk["_join_key"] = lk["employee_name_lc"]
+    elif name == "fault_type":
+        lk["_join_key"] = lk[key].astype(str).str.strip().str.lower()
+    else:
+        lk["_join_key"] = lk[key]
+    if key in ("service_code", "state_key"):
+        # same column name on the ticket side; keep the ticket's copy only
+        lk = lk.drop(columns=key)
+    return lk
+
+
+def precompute_lookups(tables: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Prepare the lookup tables once (column names, normalized join keys) so repeated
+    enrich_tickets/process_tickets calls, e.g. over batches of tickets, skip that work.
+    Returns a copy of tables with the lookup entries replaced; other entries are passed through.
+    """
+    out = dict(tables)
+    for name in LOOKUP_KEYS:
+        if out.get(name) is not None and not out[name].empty:
+            out[name] = _prepare_lookup(name, out[name])
+    return out
+
+
+def _join_lookups(df: pd.DataFrame, employees_df: pd.DataFrame = None, channel_df: pd.DataFrame = None,
+                  service_type_df: pd.DataFrame = None, fault_type_df: pd.DataFrame = None,
+                  location_df: pd.DataFrame = None):
+    """
+    Build the lookup column blocks for the tickets in df, in join order, for _with_columns.
+    Ticket-side helper columns (operator_lc, or the employee placeholders when there is no
+    employees table) are added to df in place.
+    """
+    blocks = []
+    taken = set(df.columns)
+
+    def add(name, lookup_df, left_key, suffix):
+        block = _lookup_block(_prepare_lookup(name, lookup_df), left_key, taken, suffix)
+        taken.update(block.columns)
+        blocks.append(block)
 
     # standardize employees: ensure employee id/name columns exist
     if employees_df is not None and not employees_df.empty:
-        emp = employees_df.rename(columns=lambda s: s.strip().lower().replace(" ", "_"))
         # join by operator name (employee_name) matching Operator in tickets (case-insensitive)
-        emp["employee_name_lc"] = emp.get("employee_name", emp.get("employee_name", "")).astype(str).str.lower()
-        df["operator_lc"] = df["operator"].astype(str).str.lower()
-        df = df.merge(emp, left_on="operator_lc", right_on="employee_name_lc", how="left", suffixes=("", "_emp"))
+        if isinstance(df["operator"].dtype, pd.CategoricalDtype):
+            # lowercase the categories only and keep the row codes, so the join stays on integer codes
+            lc_codes, lc_cats = pd.factorize(df["operator"].cat.categories.str.lower())
+            codes = df["operator"].cat.codes.to_numpy()
+            df["operator_lc"] = pd.Categorical.from_codes(np.where(codes >= 0, lc_codes[codes], -1), categories=lc_cats)
+        else:
+            df["operator_lc"] = df["operator"].astype(str).str.lower()
+        taken.add("operator_lc")
+        add("employees", employees_df, df["operator_lc"], "_emp")
     else:
         df["employee_id"] = np.nan
         df["manager_id"] = np.nan
         df["designation"] = np.nan
         df["manager"] = np.nan
+        taken.update(["employee_id", "manager_id", "designation", "manager"])
 
     # channel
     if channel_df is not None and not channel_df.empty:
-        ch = channel_df.rename(columns=lambda s: s.strip().lower().replace(" ", "_"))
-        df = df.merge(ch, left_on="report_channel", right_on="channel_key", how="left")
+        add("channel", channel_df, df["report_channel"], "_channel")
 
     # service_type
     if service_type_df is not None and not service_type_df.empty:
-        st = service_type_df.rename(columns=lambda s: s.strip().lower().replace(" ", "_"))
-        df = df.merge(st, left_on="service_code", right_on="service_code", how="left", suffixes=("", "_service"))
+        add("service_type", service_type_df, df["service_code"], "_service")
 
     # fault_type based on fault text (normalize)
     if fault_type_df is not None and not fault_type_df.empty:
-        ft = fault_type_df.rename(columns=lambda s: s.strip().lower().replace(" ", "_"))
-        # simple text match: left join on fault type names
-        df = df.merge(ft, left_on=df.get("fault_type", "").str.strip(), right_on="fault", how="left")
+        # simple text match: left join on fault type names (trimmed, case-insensitive)
+        if "fault_type" in df.columns:
+            fault_key = df["fault_type"].astype(str).str.strip().str.lower()
+        else:
+            fault_key = pd.Series("", index=df.index)
+        add("fault_type", fault_type_df, fault_key, "_fault")
 
     # location
     if location_df is not None and not location_df.empty:
-        loc = location_df.rename(columns=lambda s: s.strip().lower().replace(" ", "_"))
-        df = df.merge(loc, left_on="state_key", right_on="state_key", how="left", suffixes=("", "_loc"))
+        add("location", location_df, df["state_key"], "_loc")
 
-    return df
+    return blocks
+
+
+def enrich_tickets(tickets_df: pd.DataFrame, employees_df: pd.DataFrame, channel_df: pd.DataFrame = None,
+                   service_type_df: pd.DataFrame = None, fault_type_df: pd.DataFrame = None,
+                   location_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Left-join lookup tables onto tickets_df.
+    Joins performed:
+      - employees by Operator -> Employee_name or by matching Employee_name column
+      - channel by Report Channel -> Channel Key
+      - service_type by service_code -> Service Code
+      - fault_type by Fault Type text -> Fault
+      - location by State Key -> State Key
+    Lookup tables may be passed raw or as returned by precompute_lookups. Each lookup is
+    gathered by integer codes and all of them are appended in one concat, not one merge each.
+    Lookup columns clashing with existing ones get a _emp/_channel/_service/_fault/_loc suffix.
+    """
+    if tickets_df is None or tickets_df.empty:
+        return pd.DataFrame()
+
+    df = _stage_copy(tickets_df)
+    blocks = _join_lookups(df, employees_df, channel_df, service_type_df, fault_type_df, location_df)
+    return _with_columns(df, blocks)
+
+
+RESOLUTION_LABELS = ["Less Than 30 Mins", "30Mins - 1 hour", "1 hour - 3 hours", "Greater than 3 hours"]
+
+# the kernel is JIT-compiled once per process (~1.5-3s) and saves roughly 0.04-0.06s per million rows
+# over the vectorized path, so it only pays for itself on very large frames
+NUMBA_MIN_ROWS = 50_000_000
+
+if njit is not None:
+    # no cache=True: numba's on-disk cache records the importing module name, and this file is imported
+    # both as pipeline.etl and zentel_pipeline.pipeline.etl, so a cached kernel fails to load under the other
+    @njit(parallel=True)
+    def _sla_kernel(open_ns, resp_ns, res_ns, closed):
+        """
+        Compute all SLA columns in one pass over int64 nanosecond timestamps (NaT is int64 min).
+        Returns (response_seconds, resolution_seconds, resolution_minutes, response_sla_pass,
+        resolution_sla_pass, escalation, category_code); category_code indexes RESOLUTION_LABELS
+        with 4 meaning "Unknown".
+        """
+        nat = np.iinfo(np.int64).min
+        n = open_ns.shape[0]
+        response_seconds = np.empty(n, dtype=np.float64)
+        resolution_seconds = np.empty(n, dtype=np.float64)
+        resolution_minutes = np.empty(n, dtype=np.float64)
+        response_pass = np.zeros(n, dtype=np.bool_)
+        resolution_pass = np.zeros(n, dtype=np.bool_)
+        escalation = np.zeros(n, dtype=np.bool_)
+        category = np.empty(n, dtype=np.int8)
+        for i in prange(n):
+            if open_ns[i] == nat or resp_ns[i] == nat:
+                response_seconds[i] = np.nan
+            else:
+                response_seconds[i] = (resp_ns[i] - open_ns[i]) / 1e9
+                response_pass[i] = response_seconds[i] <= 10
+            if res_ns[i] == nat or resp_ns[i] == nat:
+                resolution_seconds[i] = np.nan
+                resolution_minutes[i] = np.nan
+                escalation[i] = closed[i] and res_ns[i] == nat
+                category[i] = 4
+            else:
+                secs = (res_ns[i] - resp_ns[i]) / 1e9
+                mins = secs / 60.0
+                resolution_seconds[i] = secs
+                resolution_minutes[i] = mins
+                resolution_pass[i] = mins <= 180
+                escalation[i] = mins > 180
+                if mins < 30:
+                    category[i] = 0
+                elif mins < 60:
+                    category[i] = 1
+                elif mins <= 180:
+                    category[i] = 2
+                else:
+                    category[i] = 3
+        return (response_seconds, resolution_seconds, resolution_minutes, response_pass, resolution_pass,
+                escalation, category)
+
+
+def _sla_columns(d: pd.DataFrame) -> pd.DataFrame:
+    """
+    The columns compute_sla_metrics adds to d (missing time columns first, then the metrics),
+    as a separate frame on d's index so callers can attach them without copying d.
+    """
+    out = {}
+    # make sure the time columns exist as datetime64 so the subtractions below stay vectorized
+    times = {}
+    for col in ["ticket_open_time", "ticket_resp_time", "issue_res_time"]:
+        if col in d.columns:
+            times[col] = d[col]
+        else:
+            times[col] = out[col] = pd.Series(pd.NaT, index=d.index, dtype="datetime64[ns]")
+
+    # escalation: unresolved within 3 hours (resolution_minutes > 180) OR closed but no issue_res_time
+    if "ticket_status" in d.columns:
+        status = d["ticket_status"].astype(str).str.lower()
+    else:
+        status = pd.Series("", index=d.index)
+    closed = status.isin(["completed", "closed"])
+
+    if njit is not None and len(d) >= NUMBA_MIN_ROWS:
+        # single compiled pass over the int64 nanosecond views of the time columns
+        views = [times[c].to_numpy(dtype="datetime64[ns]").view("i8")
+                 for c in ("ticket_open_time", "ticket_resp_time", "issue_res_time")]
+        (out["response_seconds"], out["resolution_seconds"], out["resolution_minutes"], out["response_sla_pass"],
+         out["resolution_sla_pass"], out["escalation"], codes) = _sla_kernel(*views, closed.to_numpy())
+        cat = pd.Categorical.from_codes(codes, categories=RESOLUTION_LABELS + ["Unknown"])
+        out["resolution_category"] = pd.Series(cat, index=d.index).astype(object)
+        return pd.DataFrame(out, index=d.index)
+
+    # compute durations; NaT propagates to NaN
+    response_seconds = (times["ticket_resp_time"] - times["ticket_open_time"]).dt.total_seconds()
+    resolution_seconds = (times["issue_res_time"] - times["ticket_resp_time"]).dt.total_seconds()
+    resolution_minutes = resolution_seconds / 60.0
+    out["response_seconds"] = response_seconds
+    out["resolution_seconds"] = resolution_seconds
+    out["resolution_minutes"] = resolution_minutes
+
+    # pass/fail flags; missing durations count as a fail
+    out["response_sla_pass"] = (response_seconds <= 10).fillna(False).astype(bool)
+    out["resolution_sla_pass"] = (resolution_minutes <= 180).fillna(False).astype(bool)
+
+    out["escalation"] = ((resolution_minutes > 180).fillna(False) | (closed & times["issue_res_time"].isna())).astype(bool)
+
+    # resolution category: <30, 30 <= x < 60, 60 <= x <= 180, > 180 (180 itself is still "1 hour - 3 hours")
+    bins = [-np.inf, 30, 60, 180, np.inf]
+    cat = pd.cut(resolution_minutes, bins=bins, labels=RESOLUTION_LABELS, right=False)
+    category = cat.astype(object).where(resolution_minutes.notna(), "Unknown")
+    category[resolution_minutes.eq(180)] = "1 hour - 3 hours"
+    out["resolution_category"] = category
+
+    return pd.DataFrame(out, index=d.index)
 
 
 def compute_sla_metrics(df: pd.DataFrame) -> pd.DataFrame:
@@ -148,49 +544,42 @@ def compute_sla_metrics(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame()
 
-    d = df.copy()
-
-    # compute durations, careful with NaT
-    def secs(a, b):
-        if pd.isna(a) or pd.isna(b):
-            return np.nan
-        return (a - b).total_seconds()
-
-    d["response_seconds"] = d.apply(lambda r: secs(r.get("ticket_resp_time"), r.get("ticket_open_time")), axis=1)
-    d["resolution_seconds"] = d.apply(lambda r: secs(r.get("issue_res_time"), r.get("ticket_resp_time")), axis=1)
-    d["resolution_minutes"] = d["resolution_seconds"] / 60.0
+    d = _stage_copy(df)
+    sla = _sla_columns(d)
+    for col in sla.columns:
+        d[col] = sla[col]
+    return d
 
-    # pass/fail flags
-    d["response_sla_pass"] = d["response_seconds"].apply(lambda x: bool(x <= 10) if pd.notna(x) else False)
-    d["resolution_sla_pass"] = d["resolution_minutes"].apply(lambda x: bool(x <= 180) if pd.notna(x) else False)
 
-    # escalation: unresolved within 3 hours (resolution_minutes > 180) OR closed but no issue_res_time
-    def escalation(row):
-        if pd.notna(row.get("resolution_minutes")) and row["resolution_minutes"] > 180:
-            return True
-        # if ticket_status is Closed/Completed but we don't have issue_res_time -> escalate
-        status = str(row.get("ticket_status", "")).lower()
-        if status in ("completed", "closed") and pd.isna(row.get("issue_res_time")):
-            return True
-        return False
-
-    d["escalation"] = d.apply(escalation, axis=1)
-
-    # resolution category
-    def category(mins):
-        if pd.isna(mins):
-            return "Unknown"
-        if mins < 30:
-            return "Less Than 30 Mins"
-        if 30 <= mins < 60:
-            return "30Mins - 1 hour"
-        if 60 <= mins <= 180:
-            return "1 hour - 3 hours"
-        return "Greater than 3 hours"
-
-    d["resolution_category"] = d["resolution_minutes"].apply(category)
+def process_tickets(raw: pd.DataFrame, tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Run the whole ETL on raw tickets; same result as
+    compute_sla_metrics(enrich_tickets(clean_tickets(raw), ...lookups from tables)).
+    tables uses the load_tables keys (employees, channel, service_type, fault_type, location);
+    missing lookups are skipped.
+    The lookup columns and SLA metrics are computed as separate blocks against the cleaned
+    tickets and attached in one concat, so no intermediate full-width frame is built per stage.
+    """
+    df = clean_tickets(raw)
+    if df.empty:
+        return pd.DataFrame()
 
-    return d
+    blocks = _join_lookups(df, tables.get("employees"), channel_df=tables.get("channel"),
+                           service_type_df=tables.get("service_type"), fault_type_df=tables.get("fault_type"),
+                           location_df=tables.get("location"))
+    taken = set(df.columns).union(*(b.columns for b in blocks))
+    sla = _sla_columns(df)
+    if blocks:
+        sla = sla.reset_index(drop=True)
+    # metrics already present in the input are overwritten in place, as compute_sla_metrics does
+    new = [c for c in sla.columns if c not in taken]
+    if blocks:
+        out = _with_columns(df, blocks + [sla[new]])
+    else:
+        out = pd.concat([df, sla[new]], axis=1)
+    for col in sla.columns.difference(new, sort=False):
+        out[col] = sla[col]
+    return out
 
 
 def manager_operator_performance(df: pd.DataFrame) -> Dict:
@@ -203,36 +592,38 @@ def manager_operator_performance(df: pd.DataFrame) -> Dict:
     if df is None or df.empty:
         return {"operators": {}, "managers": {}}
 
-    d = df.copy()
+    d = _stage_copy(df)
 
-    # operator metrics
-    ops = d.groupby("operator").agg(
+    # a single pass over the tickets collects sums and counts per (manager, operator);
+    # operator and manager KPIs are then exact re-aggregations of that small frame
+    keys = ["manager", "operator"] if "manager" in d.columns else ["operator"]
+    d["response_sla_pass"] = d["response_sla_pass"].astype("int8")
+    per = d.groupby(keys, observed=True, sort=False, dropna=False).agg(
         total_tickets=pd.NamedAgg(column="report_id", aggfunc="count"),
-        avg_response_seconds=pd.NamedAgg(column="response_seconds", aggfunc="mean"),
-        avg_resolution_minutes=pd.NamedAgg(column="resolution_minutes", aggfunc="mean"),
-        sla_pass_rate=pd.NamedAgg(column="response_sla_pass", aggfunc=lambda x: float(x.sum()) / len(x) if len(x) > 0 else 0.0)
-    ).reset_index()
-
-    operators = {row["operator"]: {
-        "total_tickets": int(row["total_tickets"]),
-        "avg_response_seconds": float(round(row["avg_response_seconds"] or 0.0, 2)),
-        "avg_resolution_minutes": float(round(row["avg_resolution_minutes"] or 0.0, 2)),
-        "sla_pass_rate": float(round(row["sla_pass_rate"] or 0.0, 3))
-    } for _, row in ops.iterrows()}
+        response_sum=pd.NamedAgg(column="response_seconds", aggfunc="sum"),
+        response_n=pd.NamedAgg(column="response_seconds", aggfunc="count"),
+        resolution_sum=pd.NamedAgg(column="resolution_minutes", aggfunc="sum"),
+        resolution_n=pd.NamedAgg(column="resolution_minutes", aggfunc="count"),
+        sla_pass_sum=pd.NamedAgg(column="response_sla_pass", aggfunc="sum"),
+        rows=pd.NamedAgg(column="response_sla_pass", aggfunc="size"),
+    )
+
+    def _kpis(g: pd.DataFrame, with_pass_rate: bool) -> Dict:
+        out = pd.DataFrame({
+            "total_tickets": g["total_tickets"].astype(int),
+            "avg_response_seconds": (g["response_sum"] / g["response_n"]).fillna(0.0).round(2),
+            "avg_resolution_minutes": (g["resolution_sum"] / g["resolution_n"]).fillna(0.0).round(2),
+        })
+        if with_pass_rate:
+            out["sla_pass_rate"] = (g["sla_pass_sum"] / g["rows"]).fillna(0.0).round(3)
+        return out.to_dict(orient="index")
+
+    # operator metrics; the pass rate is the share of tickets passing the response SLA
+    operators = _kpis(per.groupby(level="operator", observed=True, sort=False).sum(), with_pass_rate=True)
 
     # manager metrics (use manager column if exists; else try manager from employees)
     if "manager" in d.columns:
-        mgr_group = d.groupby("manager").agg(
-            total_tickets=pd.NamedAgg(column="report_id", aggfunc="count"),
-            avg_response_seconds=pd.NamedAgg(column="response_seconds", aggfunc="mean"),
-            avg_resolution_minutes=pd.NamedAgg(column="resolution_minutes", aggfunc="mean"),
-        ).reset_index()
-
-        managers = {row["manager"]: {
-            "total_tickets": int(row["total_tickets"]),
-            "avg_response_seconds": float(round(row["avg_response_seconds"] or 0.0, 2)),
-            "avg_resolution_minutes": float(round(row["avg_resolution_minutes"] or 0.0, 2)),
-        } for _, row in mgr_group.iterrows()}
+        managers = _kpis(per.groupby(level="manager", observed=True, sort=False).sum(), with_pass_rate=False)
     else:
         managers = {}
 
@@ -1,6 +1,9 @@
 # tests/test_etl.py
+import os
 import pandas as pd
-from pipeline.etl import clean_tickets, compute_sla_metrics, manager_operator_performance
+from pipeline.etl import (load_tables, clean_tickets, enrich_tickets, compute_sla_metrics, manager_operator_performance,
+                          precompute_lookups, process_tickets, TEXT_DTYPE,
+                          PARQUET_CACHE_VERSION)
 
 def test_clean_tickets_parses_datetimes_and_fills_operator():
     raw = pd.DataFrame({
@@ -35,3 +38,139 @@ def test_manager_operator_performance_empty():
     res = manager_operator_performance(pd.DataFrame())
     assert isinstance(res, dict)
     assert "operators" in res and "managers" in res
+
+def test_clean_tickets_parses_mixed_formats_per_row():
+    raw = pd.DataFrame({
+        "Report ID": ["r1", "r2", "r3", "r4"],
+        "Ticket Open Time": ["2020/12/31 17:07:04", "12/31/2020 17:10", "13/01/2020 10:00:00", ""],
+    })
+    cleaned = clean_tickets(raw)
+    assert list(cleaned["ticket_open_time"][:3]) == [
+        pd.Timestamp("2020-12-31 17:07:04"),
+        pd.Timestamp("2020-12-31 17:10:00"),
+        pd.Timestamp("2020-01-13 10:00:00"),
+    ]
+    assert pd.isna(cleaned.loc[3, "ticket_open_time"])
+
+def test_enrich_tickets_fault_type_lookup():
+    employees = pd.DataFrame({"Employee Name": ["alice"], "Manager": ["Mgr A"]})
+    faults = pd.DataFrame({"Fault": ["No Signal"], "Fault Key": ["F1"]})
+    tickets = pd.DataFrame({"report_id": ["r1", "r2"], "operator": ["Alice", "Bob"],
+                            "fault_type": [" no signal", "Other"]})
+    enriched = enrich_tickets(tickets, employees, fault_type_df=faults)
+    assert list(enriched["manager"].fillna("")) == ["Mgr A", ""]
+    assert list(enriched["fault_key"].fillna("")) == ["F1", ""]
+
+    # tickets without a fault_type column still get the lookup columns, unmatched
+    enriched = enrich_tickets(tickets.drop(columns="fault_type"), employees, fault_type_df=faults)
+    assert len(enriched) == 2
+    assert enriched["fault_key"].isna().all()
+
+def test_process_tickets_matches_staged_pipeline():
+    raw = pd.DataFrame({
+        "Report ID": ["AXA-20201231-1101-WLESS", "AXA-20201231-1102-FIBR"],
+        "Ticket Open Time": ["2020/12/31 17:07:04", "2020/12/31 17:07:04"],
+        "Ticket Resp Time": ["12/31/2020 17:10", "2020/12/31 17:07:08"],
+        "Issue Res Time": ["12/31/2020 20:44", ""],
+        "Ticket Status": ["Completed", "Closed"],
+        "Operator": ["Alice", ""],
+        "Report Channel": ["CH01", "CH02"],
+    })
+    tables = {
+        "employees": pd.DataFrame({"Employee Name": ["alice"], "Manager": ["Mgr A"]}),
+        "channel": pd.DataFrame({"Channel Key": ["CH01"], "Channel": ["Phone"]}),
+    }
+    staged = compute_sla_metrics(enrich_tickets(clean_tickets(raw), tables["employees"], channel_df=tables["channel"]))
+    pd.testing.assert_frame_equal(process_tickets(raw, tables), staged)
+    # prepared lookups give the same result
+    pd.testing.assert_frame_equal(process_tickets(raw, precompute_lookups(tables)), staged)
+
+def test_load_tables_strips_values_and_tolerates_missing_files(tmp_path):
+    (tmp_path / "service_data.csv").write_text("Report ID,Operator\n AXA-1-WLESS , Bob \nAXA-2-FIBR,\n")
+    (tmp_path / "channel.csv").write_text("Channel Key,Channel\nCH01, Phone\n")
+    tables = load_tables(str(tmp_path))
+    assert set(tables) == {"service_data", "employees", "service_type", "channel", "fault_type", "location"}
+    assert list(tables["service_data"]["Report ID"]) == ["AXA-1-WLESS", "AXA-2-FIBR"]
+    assert tables["service_data"].loc[0, "Operator"] == "Bob"
+    assert pd.isna(tables["service_data"].loc[1, "Operator"])
+    assert tables["channel"].loc[0, "Channel"] == "Phone"
+    assert tables["employees"].empty
+
+def test_load_tables_caches_csv_as_parquet(tmp_path):
+    (tmp_path / "channel.csv").write_text("Channel Key,Channel\nCH01, Phone\n")
+    first = load_tables(str(tmp_path))["channel"]
+    assert (tmp_path / f"channel.v{PARQUET_CACHE_VERSION}.parquet").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+    # the cached copy is used while the CSV is unchanged
+    (tmp_path / "channel.csv").unlink()
+    cached = load_tables(str(tmp_path))["channel"]
+    pd.testing.assert_frame_equal(cached, first)
+    assert (cached.dtypes == TEXT_DTYPE).all()
+
+def test_clean_tickets_service_code_is_last_hyphen_piece():
+    raw = pd.DataFrame({"Report ID": ["AXA-20201231-1101-WLESS", "AXA-1-FIBR", "NOCODE"]})
+    cleaned = clean_tickets(raw)
+    assert list(cleaned["service_code"]) == ["WLESS", "FIBR", ""]
+
+def test_clean_tickets_stores_text_as_arrow_strings():
+    raw = pd.DataFrame({"Report ID": ["AXA-1-WLESS"], "Ticket Status": ["Completed"], "Operator": ["Bob"]}, dtype=object)
+    cleaned = clean_tickets(raw)
+    assert cleaned["report_id"].dtype == TEXT_DTYPE
+    assert cleaned["ticket_status"].dtype == TEXT_DTYPE
+    assert isinstance(cleaned["operator"].dtype, pd.CategoricalDtype)
+
+def test_load_tables_keeps_values_as_written(tmp_path):
+    (tmp_path / "location.csv").write_text("State Key,State\n007,Lagos\n08, Abuja \n")
+    (tmp_path / "employees.csv").write_text("Employee ID,Rate,Active\n0012,1.50,TRUE\n")
+    tables = load_tables(str(tmp_path))
+    assert list(tables["location"]["State Key"]) == ["007", "08"]
+    assert list(tables["location"]["State"]) == ["Lagos", "Abuja"]
+    assert tables["employees"].iloc[0].tolist() == ["0012", "1.50", "TRUE"]
+
+def test_load_tables_falls_back_to_csv_on_bad_cache(tmp_path):
+    (tmp_path / "channel.csv").write_text("Channel Key,Channel\nCH01,Phone\n")
+    # truncated cache newer than its CSV, and a stale cache from an older read logic
+    (tmp_path / f"channel.v{PARQUET_CACHE_VERSION}.parquet").write_bytes(b"PAR1 trunc")
+    (tmp_path / "channel.parquet").write_bytes(b"stale")
+    assert load_tables(str(tmp_path))["channel"].loc[0, "Channel"] == "Phone"
+    # the bad cache has been rewritten
+    assert load_tables(str(tmp_path))["channel"].loc[0, "Channel"] == "Phone"
+    assert pd.read_parquet(tmp_path / f"channel.v{PARQUET_CACHE_VERSION}.parquet").loc[0, "Channel"] == "Phone"
+
+def test_load_tables_rebuilds_cache_when_csv_changes_within_same_mtime(tmp_path):
+    csv_path = tmp_path / "channel.csv"
+    csv_path.write_text("Channel Key,Channel\nCH01,Phone\n")
+    st = csv_path.stat()
+    assert load_tables(str(tmp_path))["channel"].loc[0, "Channel"] == "Phone"
+    # rewritten with an identical mtime (coarse filesystem clock); the size still differs
+    csv_path.write_text("Channel Key,Channel\nCH01,E-mail\n")
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    tables = load_tables(str(tmp_path))
+    assert tables["channel"].loc[0, "Channel"] == "E-mail"
+    assert tables["channel"]["Channel"].dtype == TEXT_DTYPE
+
+def test_load_tables_renames_repeated_headers_like_pandas(tmp_path):
+    (tmp_path / "channel.csv").write_text("Channel Key,Channel,Channel\nCH01, Phone , Email \n")
+    tables = load_tables(str(tmp_path))
+    assert list(tables["channel"].columns) == ["Channel Key", "Channel", "Channel.1"]
+    assert tables["channel"].iloc[0].tolist() == ["CH01", "Phone", "Email"]
+
+def test_enrich_tickets_categorical_keys():
+    raw = pd.DataFrame({"Report ID": ["r1", "r2", "r3"], "Operator": ["Alice", "ALICE", "bob"],
+                        "Report Channel": ["CH01", None, "CH01"]})
+    tickets = clean_tickets(raw)
+    assert isinstance(tickets["report_channel"].dtype, pd.CategoricalDtype)
+    employees = pd.DataFrame({"Employee Name": ["alice"], "Manager": ["Mgr A"]})
+    # CH99 only exists in the lookup; it must not match the ticket with a missing channel
+    channels = pd.DataFrame({"Channel Key": ["CH01", "CH99"], "Channel": ["Phone", "Email"]})
+    enriched = enrich_tickets(tickets, employees, channel_df=channels)
+    assert list(enriched["manager"].fillna("")) == ["Mgr A", "Mgr A", ""]
+    assert list(enriched["channel"].fillna("")) == ["Phone", "", "Phone"]
+    assert isinstance(enriched["operator_lc"].dtype, pd.CategoricalDtype)
+
+def test_enrich_tickets_duplicate_lookup_key_first_row_wins():
+    tickets = pd.DataFrame({"report_id": ["r1", "r2"], "operator": ["Alice", "Bob"]})
+    employees = pd.DataFrame({"Employee Name": ["alice", "Alice", "bob"], "Manager": ["Mgr A", "Mgr B", "Mgr C"]})
+    enriched = enrich_tickets(tickets, employees)
+    assert len(enriched) == 2
+    assert list(enriched["manager"]) == ["Mgr A", "Mgr C"]
@@ -0,0 +1,25 @@
+# tests/test_ranking.py
+import pandas as pd
+from pipeline.etl import manager_operator_performance
+
+def test_manager_operator_performance_kpis():
+    df = pd.DataFrame({
+        "report_id": ["r1", "r2", "r3"],
+        "operator": ["alice", "alice", "bob"],
+        "manager": ["Mgr A", "Mgr A", "Mgr A"],
+        "response_seconds": [5.0, 15.0, float("nan")],
+        "resolution_minutes": [30.0, 90.0, float("nan")],
+        "response_sla_pass": [True, False, False],
+    })
+    res = manager_operator_performance(df)
+    assert res["operators"]["alice"] == {
+        "total_tickets": 2,
+        "avg_response_seconds": 10.0,
+        "avg_resolution_minutes": 60.0,
+        "sla_pass_rate": 0.5,
+    }
+    # operators without any measured durations report 0.0 rather than NaN
+    assert res["operators"]["bob"]["avg_response_seconds"] == 0.0
+    assert isinstance(res["operators"]["bob"]["total_tickets"], int)
+    assert res["managers"]["Mgr A"]["total_tickets"] == 3
+    assert res["managers"]["Mgr A"]["avg_response_seconds"] == 10.0
@@ -1,5 +1,6 @@
 # tests/test_sla.py
 import pandas as pd
+import pytest
 from zentel_pipeline.pipeline.etl import compute_sla_metrics
 
 def test_escalation_flag():
@@ -12,3 +13,72 @@ def test_escalation_flag():
     })
     res = compute_sla_metrics(df)
     assert res.loc[0, "escalation"] == True
+
+def test_missing_resolution_time_yields_nan():
+    df = pd.DataFrame({
+        "report_id": ["r1", "r2"],
+        "ticket_open_time": [pd.to_datetime("2020-01-01 10:00:00"), pd.NaT],
+        "ticket_resp_time": [pd.to_datetime("2020-01-01 10:00:20"), pd.to_datetime("2020-01-01 10:00:00")],
+    })
+    res = compute_sla_metrics(df)
+    assert res.loc[0, "response_seconds"] == 20
+    assert pd.isna(res.loc[1, "response_seconds"])
+    assert res["resolution_minutes"].isna().all()
+    assert list(res["response_sla_pass"]) == [False, False]
+    assert list(res["resolution_category"]) == ["Unknown", "Unknown"]
+
+def test_escalation_flag_closed_without_resolution_time():
+    df = pd.DataFrame({
+        "report_id": ["r1", "r2", "r3"],
+        "ticket_open_time": [pd.to_datetime("2020-01-01 10:00:00")] * 3,
+        "ticket_resp_time": [pd.to_datetime("2020-01-01 10:00:05")] * 3,
+        "issue_res_time": [pd.NaT, pd.NaT, pd.to_datetime("2020-01-01 10:30:05")],
+        "ticket_status": ["Closed", "In Progress", "Completed"]
+    })
+    res = compute_sla_metrics(df)
+    assert list(res["escalation"]) == [True, False, False]
+
+def test_resolution_category_boundaries():
+    resp = pd.to_datetime("2020-01-01 10:00:00")
+    minutes = [0, 29.5, 30, 59, 60, 180, 180.5]
+    df = pd.DataFrame({
+        "report_id": [f"r{i}" for i in range(len(minutes))],
+        "ticket_open_time": [resp] * len(minutes),
+        "ticket_resp_time": [resp] * len(minutes),
+        "issue_res_time": [resp + pd.Timedelta(minutes=m) for m in minutes],
+    })
+    res = compute_sla_metrics(df)
+    assert list(res["resolution_category"]) == [
+        "Less Than 30 Mins", "Less Than 30 Mins",
+        "30Mins - 1 hour", "30Mins - 1 hour",
+        "1 hour - 3 hours", "1 hour - 3 hours",
+        "Greater than 3 hours",
+    ]
+
+def test_numba_kernel_matches_vectorized_path(monkeypatch):
+    pytest.importorskip("numba")
+    from zentel_pipeline.pipeline import etl
+    resp = pd.to_datetime("2020-01-01 10:00:00")
+    minutes = [0, 29.5, 30, 60, 180, 180.5, None, None]
+    df = pd.DataFrame({
+        "report_id": [f"r{i}" for i in range(len(minutes))],
+        "ticket_open_time": [resp - pd.Timedelta(seconds=s) for s in (5, 10, 11, 0, 3, 20, 1, 2)],
+        "ticket_resp_time": [resp] * (len(minutes) - 1) + [pd.NaT],
+        "issue_res_time": [resp + pd.Timedelta(minutes=m) if m is not None else pd.NaT for m in minutes],
+        "ticket_status": ["Completed"] * 6 + ["Closed", "Open"],
+    })
+    expected = compute_sla_metrics(df)
+    monkeypatch.setattr(etl, "NUMBA_MIN_ROWS", 0)
+    res = etl.compute_sla_metrics(df)
+    pd.testing.assert_frame_equal(res, expected)
+
+def test_compute_sla_does_not_modify_input():
+    df = pd.DataFrame({
+        "report_id": ["r1"],
+        "ticket_open_time": [pd.to_datetime("2020-01-01 10:00:00")],
+        "ticket_resp_time": [pd.to_datetime("2020-01-01 10:00:05")],
+    })
+    before = df.copy()
+    res = compute_sla_metrics(df)
+    res.loc[0, "ticket_open_time"] = pd.NaT
+    pd.testing.assert_frame_equal(df, before)